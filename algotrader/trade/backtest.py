@@ -1,7 +1,12 @@
+import os
+import warnings
+
 import pandas as pd
 import numpy as np
 from backtesting import Backtest, Strategy
 
+from algotrader.trade.cache import BacktestCache, CACHE_ERRORS, UncacheableError, make_key
+
 # ------------------------------
 # Strategy Base
 # ------------------------------
@@ -15,10 +20,19 @@ class StrategyBase:
 # Backtest Engine
 # ------------------------------
 
-def run_backtest(df: pd.DataFrame, generate_signal, **kwargs):
+def run_backtest(df: pd.DataFrame, generate_signal, cache=None, **kwargs):
     """
     Run a backtest with backtesting.py given OHLC DataFrame and strategy class.
+
+    :param cache: Optional BacktestCache (or cache directory path). Identical calls return
+                  the cached stats. Strategies or kwargs without a stable identity
+                  (e.g. no source code) and cache read/write errors bypass the cache with a
+                  warning. On a cache hit the
+                  returned Backtest has not been run, so call `bt.run()` before `bt.plot()`.
     """
+    if isinstance(cache, (str, os.PathLike)):
+        cache = BacktestCache(cache)
+
     # Create a wrapper Strategy class for backtesting.py
     class StrategyWrapper(Strategy):
         def init(self):
@@ -65,5 +79,28 @@ def run_backtest(df: pd.DataFrame, generate_signal, **kwargs):
                     self.position.close()
 
     bt = Backtest(df, StrategyWrapper, **kwargs)
-    return bt.run(), bt
+
+    if cache is None:
+        return bt.run(), bt
+
+    try:
+        key = make_key(df, generate_signal, **kwargs)
+    except UncacheableError as e:
+        warnings.warn(f"Backtest cache bypassed: {e}")
+        return bt.run(), bt
+
+    try:
+        stats = cache.get(key)
+    except CACHE_ERRORS as e:
+        warnings.warn(f"Backtest cache read failed: {e}")
+        stats = None
+    if stats is not None:
+        return stats, bt
+
+    stats = bt.run()
+    try:
+        cache.put(key, stats)
+    except CACHE_ERRORS as e:
+        warnings.warn(f"Backtest cache write failed: {e}")
+    return stats, bt
 
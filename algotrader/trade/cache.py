@@ -0,0 +1,344 @@
+import os
+import json
+import types
+import functools
+import shutil
+import pickle
+import hashlib
+import inspect
+import tempfile
+from importlib import metadata
+
+import pandas as pd
+import numpy as np
+
+CHUNK_BYTES = 1 << 24
+FRAMES = ('_trades', '_equity_curve')
+PRIMITIVES = (type(None), bool, int, float, complex, str, bytes)
+PICKLE_HOOKS = ('__slots__', '__getstate__', '__setstate__', '__reduce__', '__reduce_ex__')
+# Errors from reading or writing an entry (I/O, pickle, pyarrow) that should not fail a backtest
+CACHE_ERRORS = (OSError, ValueError, TypeError, NotImplementedError, EOFError, pickle.PickleError)
+
+
+class UncacheableError(ValueError):
+    """Raised when a value has no stable identity to build a cache key from."""
+
+
+# ------------------------------
+# Cache Keys
+# ------------------------------
+def _library_version() -> str:
+    """
+    Return the installed algotrader and backtesting.py versions.
+    """
+    versions = []
+    for package in ('algotrader', 'backtesting'):
+        try:
+            versions.append(f"{package}=={metadata.version(package)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{package}==unknown")
+    return ";".join(versions)
+
+
+def _update_array(h, values):
+    """
+    Feed an array's raw bytes into a hash object in fixed-size chunks, without copying contiguous data.
+    """
+    values = np.asarray(values)
+    if values.dtype == object:
+        values = np.array([repr(v) for v in values], dtype=str)
+    values = np.ascontiguousarray(values)
+
+    h.update(f"{values.dtype.str}{values.shape}".encode())
+    buffer = values.reshape(-1).view(np.uint8)
+    for start in range(0, len(buffer), CHUNK_BYTES):
+        h.update(buffer[start:start + CHUNK_BYTES])
+
+
+def hash_data(df: pd.DataFrame) -> str:
+    """
+    Hash the index and columns of an OHLCV DataFrame.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    _update_array(h, df.index.values)
+    for col in df.columns:
+        h.update(str(col).encode())
+        _update_array(h, df[col].values)
+    return h.hexdigest()
+
+
+def _update_function(h, func, seen):
+    """
+    Hash a function by name, source code, defaults, closure cells and the globals it references.
+    """
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        raise UncacheableError(f"Source of {func!r} is not available")
+
+    h.update(f"{func.__module__}.{func.__qualname__}".encode())
+    h.update(source.encode())
+    _update_value(h, func.__defaults__, seen)
+    _update_value(h, func.__kwdefaults__, seen)
+    _update_value(h, [cell.cell_contents for cell in func.__closure__ or ()], seen)
+
+    names = [name for name in func.__code__.co_names if name in func.__globals__]
+    for name in names:
+        value = func.__globals__[name]
+        if not isinstance(value, types.ModuleType):
+            h.update(name.encode())
+            _update_value(h, value, seen)
+
+
+@functools.lru_cache(maxsize=None)
+def _is_plain_class(cls) -> bool:
+    """
+    Return True if instances of `cls` keep all their state in `vars()`: every class in its MRO
+    is defined in Python source and none uses __slots__ or custom pickling hooks.
+    """
+    for base in cls.__mro__[:-1]:
+        if any(hook in base.__dict__ for hook in PICKLE_HOOKS):
+            return False
+        try:
+            if not inspect.getfile(base).endswith('.py'):
+                return False
+        except TypeError:
+            return False
+    return True
+
+
+def _update_value(h, value, seen):
+    """
+    Feed the content of a strategy parameter or Backtest kwarg into a hash object.
+    Raises UncacheableError when the value has no identity that is stable across processes.
+    """
+    h.update(type(value).__qualname__.encode())
+
+    if isinstance(value, PRIMITIVES):
+        h.update(repr(value).encode())
+        return
+    if isinstance(value, (types.ModuleType, types.BuiltinFunctionType)):
+        h.update(f"{getattr(value, '__module__', '')}.{value.__name__}".encode())
+        return
+
+    # Keep visited objects alive so temporary containers cannot have their id reused
+    if id(value) in seen:
+        return
+    seen[id(value)] = value
+
+    if isinstance(value, pd.DataFrame):
+        h.update(hash_data(value).encode())
+    elif isinstance(value, (pd.Series, pd.Index)):
+        _update_array(h, value.index.values)
+        _update_array(h, value.values)
+    elif isinstance(value, np.ndarray):
+        _update_array(h, value)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _update_value(h, item, seen)
+    elif isinstance(value, (set, frozenset)):
+        for item in sorted(value, key=repr):
+            _update_value(h, item, seen)
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            _update_value(h, key, seen)
+            _update_value(h, value[key], seen)
+    elif isinstance(value, functools.partial):
+        _update_value(h, [value.func, value.args, value.keywords], seen)
+    elif isinstance(value, types.MethodType):
+        _update_value(h, [value.__func__, value.__self__], seen)
+    elif isinstance(value, types.FunctionType):
+        _update_function(h, value, seen)
+    elif isinstance(value, type):
+        try:
+            h.update(inspect.getsource(value).encode())
+        except (OSError, TypeError):
+            h.update(f"{value.__module__}.{value.__qualname__}".encode())
+    elif hasattr(value, '__dict__') and _is_plain_class(type(value)):
+        _update_value(h, type(value), seen)
+        _update_value(h, vars(value), seen)
+    else:
+        # State held in C or behind pickling hooks is not visible through vars()
+        try:
+            h.update(pickle.dumps(value, protocol=4))
+        except Exception as e:
+            raise UncacheableError(f"{value!r} has no stable identity: {e}")
+
+
+def _hash_value(value) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    _update_value(h, value, {})
+    return h.hexdigest()
+
+
+def make_key(df: pd.DataFrame, generate_signal, **kwargs) -> str:
+    """
+    Build the cache key of a `run_backtest` call from its data, strategy, Backtest kwargs and library version.
+
+    The strategy is identified by its source code, closure, defaults, referenced globals and,
+    for bound methods and partials, the bound instance attributes or arguments.
+    Raises UncacheableError when the strategy or kwargs have no stable identity.
+    """
+    payload = {
+        'data': hash_data(df),
+        'strategy': _hash_value(generate_signal),
+        'kwargs': _hash_value(kwargs),
+        'version': _library_version(),
+    }
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+# ------------------------------
+# Result Cache
+# ------------------------------
+class BacktestCache:
+    """
+    On-disk cache of `run_backtest` results with a size cap and least-recently-used eviction.
+
+    Each entry is a directory holding the stats Series (pickled) and the trade and equity frames (parquet).
+    """
+    def __init__(self, path: str = '.backtest_cache', max_size: int = 1 << 30):
+        """
+        :param path: Cache directory
+        :param max_size: Maximum total size of cached entries in bytes
+        """
+        self.path = path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.path, exist_ok=True)
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.path, key)
+
+    def get(self, key: str):
+        """
+        Return the cached stats Series for `key`, or None on a miss.
+        An entry removed by another process while it is being read counts as a miss.
+        """
+        entry = self._entry(key)
+        try:
+            with open(os.path.join(entry, 'stats.pkl'), 'rb') as f:
+                stats = pickle.load(f)
+            for name in FRAMES:
+                stats[name] = pd.read_parquet(os.path.join(entry, f'{name}.parquet'))
+            os.utime(entry)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return stats
+
+    def put(self, key: str, stats: pd.Series):
+        """
+        Store a stats Series under `key` and evict old entries if the cache is over its size cap.
+        The `_strategy` object is stored by name only.
+        """
+        stats = stats.copy()
+        stats['_strategy'] = str(stats['_strategy'])
+
+        os.makedirs(self.path, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=self.path, prefix='.tmp-')
+        try:
+            for name in FRAMES:
+                stats[name].to_parquet(os.path.join(tmp, f'{name}.parquet'), engine="pyarrow")
+            with open(os.path.join(tmp, 'stats.pkl'), 'wb') as f:
+                pickle.dump(stats.drop(list(FRAMES)), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            self.invalidate(key)
+            try:
+                os.replace(tmp, self._entry(key))
+            except OSError:
+                # Another process stored the same key first; its entry is equivalent.
+                if not os.path.isdir(self._entry(key)):
+                    raise
+                shutil.rmtree(tmp, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        self.evict()
+
+    def invalidate(self, key: str) -> bool:
+        """
+        Remove a single entry. Returns True if it existed.
+        """
+        try:
+            shutil.rmtree(self._entry(key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def clear(self):
+        """
+        Remove all entries and reset hit/miss counters.
+        """
+        for key in self._entries():
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _entries(self) -> list:
+        if not os.path.isdir(self.path):
+            return []
+        return [name for name in os.listdir(self.path)
+                if not name.startswith('.') and os.path.isdir(self._entry(name))]
+
+    def _entry_size(self, key: str) -> int:
+        """
+        Size of an entry in bytes; files removed concurrently count as 0.
+        """
+        entry = self._entry(key)
+        try:
+            names = os.listdir(entry)
+        except FileNotFoundError:
+            return 0
+
+        size = 0
+        for name in names:
+            try:
+                size += os.path.getsize(os.path.join(entry, name))
+            except FileNotFoundError:
+                pass
+        return size
+
+    def _entry_mtime(self, key: str) -> float:
+        try:
+            return os.path.getmtime(self._entry(key))
+        except FileNotFoundError:
+            return 0.0
+
+    def size(self) -> int:
+        """
+        Total size of cached entries in bytes.
+        """
+        return sum(self._entry_size(key) for key in self._entries())
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits within `max_size`.
+        """
+        entries = sorted(self._entries(), key=self._entry_mtime)
+        sizes = {key: self._entry_size(key) for key in entries}
+        total = sum(sizes.values())
+
+        for key in entries:
+            if total <= self.max_size:
+                break
+            self.invalidate(key)
+            total -= sizes[key]
+
+    def info(self) -> dict:
+        """
+        Return hit/miss counts and the current size of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries()),
+            'size': self.size(),
+            'max_size': self.max_size,
+        }
@@ -0,0 +1,236 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+
+METHODS = ('bootstrap', 'permutation', 'entry_delay')
+
+
+# ------------------------------
+# Inputs
+# ------------------------------
+def _get_trades(stats) -> pd.DataFrame:
+    """
+    Return the trade list from `run_backtest` stats or an already extracted trades DataFrame.
+    """
+    if isinstance(stats, pd.DataFrame):
+        return stats
+    return stats['_trades']
+
+
+def _get_initial_equity(stats) -> float:
+    """
+    Return the starting equity of a backtest, or None when only trades are given.
+    """
+    if isinstance(stats, pd.DataFrame):
+        return None
+    return float(stats['_equity_curve']['Equity'].iloc[0])
+
+
+# ------------------------------
+# Path Generation
+# ------------------------------
+def resample_trades(values: np.ndarray, n_paths: int, method: str = 'bootstrap', n_trades: int = None, rng=None) -> np.ndarray:
+    """
+    Build a (n_paths, n_trades) matrix of resampled per-trade values.
+
+    :param values: 1-D array of per-trade returns or PnL
+    :param method: "bootstrap" draws with replacement, "permutation" shuffles the trade order
+    :param n_trades: Trades per path (bootstrap only), defaults to len(values)
+    """
+    values = np.asarray(values, dtype=float)
+    rng = np.random.default_rng(rng)
+
+    if method == 'bootstrap':
+        n_trades = len(values) if n_trades is None else n_trades
+        return values[rng.integers(0, len(values), size=(n_paths, n_trades))]
+    elif method == 'permutation':
+        return rng.permuted(np.broadcast_to(values, (n_paths, len(values))), axis=1)
+    raise ValueError(f"Unknown resampling method: {method}")
+
+
+def delayed_entry_returns(trades: pd.DataFrame, prices: np.ndarray, n_paths: int, max_delay: int = 1, rng=None, pnl: bool = False) -> np.ndarray:
+    """
+    Build a (n_paths, n_trades) matrix of trade returns (or PnL) with each entry randomly delayed.
+
+    Each trade is re-entered at the open of a bar 0..max_delay bars after the original
+    entry (never past its exit bar) and closed at the original exit price.
+    A delay of 0 keeps the original entry price. Commissions are not re-applied.
+
+    :param prices: Open prices of the backtested data, indexed by bar number
+    :param pnl: Return PnL amounts (price change times trade size) instead of fractional returns
+    """
+    prices = np.asarray(prices, dtype=float)
+    rng = np.random.default_rng(rng)
+
+    entry_bar = trades['EntryBar'].to_numpy(dtype=np.int64)
+    exit_bar = trades['ExitBar'].to_numpy(dtype=np.int64)
+    entry_price = trades['EntryPrice'].to_numpy(dtype=float)
+    exit_price = trades['ExitPrice'].to_numpy(dtype=float)
+    size = trades['Size'].to_numpy(dtype=float)
+    direction = np.sign(size)
+
+    delay = rng.integers(0, max_delay + 1, size=(n_paths, len(trades)))
+    bar = np.minimum(entry_bar + delay, exit_bar)
+    delayed_price = np.where(delay == 0, entry_price, prices[bar])
+
+    if pnl:
+        return direction * (exit_price - delayed_price) * np.abs(size)
+    return direction * (exit_price / delayed_price - 1)
+
+
+# ------------------------------
+# Path Metrics
+# ------------------------------
+def equity_paths(values: np.ndarray, initial_equity: float = 1.0, compound: bool = True) -> np.ndarray:
+    """
+    Turn a (n_paths, n_trades) matrix of trade results into equity after each trade.
+
+    :param compound: If True, values are fractional returns compounded on equity;
+                     otherwise they are PnL amounts added to equity.
+    """
+    if compound:
+        return initial_equity * np.cumprod(1 + values, axis=1)
+    return initial_equity + np.cumsum(values, axis=1)
+
+
+def max_drawdowns(equity: np.ndarray, initial_equity: float = 1.0) -> np.ndarray:
+    """
+    Maximum drawdown (as a fraction of peak equity) of every path, with the initial equity as the first peak.
+    """
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), initial_equity)
+    return np.max(1 - equity / peak, axis=1)
+
+
+def sharpe_ratios(values: np.ndarray, periods: float = 1.0) -> np.ndarray:
+    """
+    Per-trade Sharpe ratio of every path, scaled by sqrt(periods) (e.g. trades per year).
+    """
+    std = values.std(axis=1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = values.mean(axis=1) / std * np.sqrt(periods)
+    return np.where(std > 0, sharpe, np.nan)
+
+
+def _simulate_chunk(values, n_paths, method, n_trades, initial_equity, compound, ruin_threshold, periods, trades, prices, max_delay, seed):
+    """
+    Simulate one chunk of paths and reduce it to per-path metrics.
+    """
+    rng = np.random.default_rng(seed)
+
+    if method == 'entry_delay':
+        sampled = delayed_entry_returns(trades, prices, n_paths, max_delay=max_delay, rng=rng, pnl=not compound)
+    else:
+        sampled = resample_trades(values, n_paths, method=method, n_trades=n_trades, rng=rng)
+
+    equity = equity_paths(sampled, initial_equity, compound=compound)
+    returns = sampled if compound else sampled / initial_equity
+
+    return np.column_stack([
+        equity[:, -1] / initial_equity - 1,
+        max_drawdowns(equity, initial_equity),
+        sharpe_ratios(returns, periods),
+        equity.min(axis=1) <= initial_equity * (1 - ruin_threshold),
+    ])
+
+
+# ------------------------------
+# Monte Carlo Engine
+# ------------------------------
+def run_monte_carlo(stats, n_paths: int = 10000, method: str = 'bootstrap', seed: int = None,
+                    n_trades: int = None, compound: bool = False, initial_equity: float = None,
+                    ruin_threshold: float = 0.5, confidence: float = 0.95, periods: float = 1.0,
+                    prices: np.ndarray = None, max_delay: int = 1, chunk_size: int = 1000,
+                    n_jobs: int = None):
+    """
+    Run Monte Carlo robustness simulations over the trades of a backtest.
+
+    Paths are simulated in chunks of `chunk_size` as 2-D NumPy arrays. Every chunk gets its
+    own seed spawned from `seed`, so results are identical whether or not a process pool is used.
+
+    :param stats: Stats Series returned by `run_backtest`, or a trades DataFrame
+    :param method: "bootstrap", "permutation" or "entry_delay" (requires `prices`)
+    :param compound: By default PnL is resampled and added to the initial equity, which matches
+                     the backtest's equity curve for any position sizing. With compound=True each
+                     trade's ReturnPct is compounded on the whole account equity instead; this is
+                     only valid for strategies that put all equity into every trade and overstates
+                     returns, drawdowns and ruin for fixed-size trades.
+    :param initial_equity: Starting equity, taken from the stats equity curve when not given
+    :param ruin_threshold: Fraction of initial equity lost at which a path counts as ruined
+    :param confidence: Confidence level of the reported intervals
+    :param periods: Sharpe ratio scaling, sqrt(periods) (e.g. trades per year)
+    :param prices: Open prices of the backtested data, used by "entry_delay"
+    :param n_jobs: Number of worker processes; None or 1 runs in-process, -1 uses all CPUs
+    :return: (summary Series, per-path DataFrame)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}, expected one of {METHODS}")
+    if method == 'entry_delay' and prices is None:
+        raise ValueError("method='entry_delay' requires prices")
+    if n_paths < 1:
+        raise ValueError("n_paths must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if n_trades is not None:
+        if method != 'bootstrap':
+            raise ValueError("n_trades is only supported with method='bootstrap'")
+        if n_trades < 2:
+            raise ValueError("n_trades must be at least 2")
+
+    trades = _get_trades(stats)
+    if len(trades) < 2:
+        raise ValueError("At least 2 trades are required for Monte Carlo simulation")
+
+    if initial_equity is None:
+        initial_equity = _get_initial_equity(stats)
+    if initial_equity is None:
+        if not compound:
+            raise ValueError("initial_equity is required when passing a trades DataFrame with compound=False")
+        initial_equity = 1.0
+    values = trades['ReturnPct' if compound else 'PnL'].to_numpy(dtype=float)
+
+    sizes = [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    chunk_args = [
+        (values, size, method, n_trades, initial_equity, compound, ruin_threshold, periods,
+         trades if method == 'entry_delay' else None, prices, max_delay, chunk_seed)
+        for size, chunk_seed in zip(sizes, seeds)
+    ]
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+
+    if n_jobs and n_jobs > 1 and len(chunk_args) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            chunks = list(pool.map(_simulate_chunk, *zip(*chunk_args)))
+    else:
+        chunks = [_simulate_chunk(*args) for args in chunk_args]
+
+    results = np.concatenate(chunks)
+    paths = pd.DataFrame({
+        'Return [%]': results[:, 0] * 100,
+        'Max. Drawdown [%]': results[:, 1] * 100,
+        'Sharpe Ratio': results[:, 2],
+        'Ruined': results[:, 3].astype(bool),
+    })
+
+    return summarize_paths(paths, confidence=confidence), paths
+
+
+def summarize_paths(paths: pd.DataFrame, confidence: float = 0.95) -> pd.Series:
+    """
+    Summarize per-path Monte Carlo results into means and confidence intervals.
+    """
+    low, high = (1 - confidence) / 2, 1 - (1 - confidence) / 2
+
+    summary = {'# Paths': len(paths)}
+    for col in ['Return [%]', 'Max. Drawdown [%]', 'Sharpe Ratio']:
+        summary[f'{col} Mean'] = paths[col].mean()
+        summary[f'{col} Median'] = paths[col].median()
+        summary[f'{col} CI Low'] = paths[col].quantile(low)
+        summary[f'{col} CI High'] = paths[col].quantile(high)
+    summary['Max. Drawdown [%] Worst'] = paths['Max. Drawdown [%]'].max()
+    summary['Risk of Ruin [%]'] = paths['Ruined'].mean() * 100
+
+    return pd.Series(summary)
@@ -0,0 +1,141 @@
+import os
+import random
+import pathlib
+import tempfile
+import threading
+import unittest
+import functools
+from unittest import mock
+
+import pandas as pd
+from backtesting.test import GOOG
+from algotrader.trade.backtest import run_backtest
+from algotrader.trade.cache import BacktestCache, UncacheableError, make_key
+
+def every_tenth_bar(df: pd.DataFrame, position, custom_data):
+    direction = None
+    if len(df) % 10 == 0:
+        direction = "close" if position else "buy"
+
+    return {
+        'direction': direction,
+        'size': 1,
+        'limit': None,
+        'stop': None,
+        'sl': None,
+        'tp': None,
+    }
+
+def every_nth_bar(df: pd.DataFrame, position, custom_data, n=10):
+    signal = every_tenth_bar(df, position, custom_data)
+    signal['direction'] = ("close" if position else "buy") if len(df) % n == 0 else None
+    return signal
+
+def make_every_nth_bar(n):
+    def signal(df, position, custom_data):
+        return every_nth_bar(df, position, custom_data, n=n)
+    return signal
+
+class TestBacktestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = BacktestCache(os.path.join(self.tmp.name, 'cache'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_returns_same_stats(self):
+        stats, _ = run_backtest(GOOG, every_tenth_bar, cache=self.cache, cash=10000)
+        cached, _ = run_backtest(GOOG, every_tenth_bar, cache=self.cache, cash=10000)
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(cached['# Trades'], stats['# Trades'])
+        self.assertEqual(cached['Return [%]'], stats['Return [%]'])
+        pd.testing.assert_frame_equal(cached['_trades'], stats['_trades'])
+        pd.testing.assert_frame_equal(cached['_equity_curve'], stats['_equity_curve'])
+
+    def test_key_changes(self):
+        key = make_key(GOOG, every_tenth_bar, cash=10000)
+        self.assertEqual(key, make_key(GOOG.copy(), every_tenth_bar, cash=10000))
+        self.assertNotEqual(key, make_key(GOOG, every_tenth_bar, cash=20000))
+        self.assertNotEqual(key, make_key(GOOG.iloc[:-1], every_tenth_bar, cash=10000))
+
+    def test_key_captures_strategy_parameters(self):
+        self.assertNotEqual(make_key(GOOG, make_every_nth_bar(10)), make_key(GOOG, make_every_nth_bar(7)))
+        self.assertEqual(make_key(GOOG, make_every_nth_bar(7)), make_key(GOOG, make_every_nth_bar(7)))
+        self.assertNotEqual(make_key(GOOG, functools.partial(every_nth_bar, n=10)),
+                            make_key(GOOG, functools.partial(every_nth_bar, n=7)))
+
+    def test_key_captures_sibling_partials(self):
+        fast = functools.partial(every_nth_bar, n=1)
+        self.assertNotEqual(make_key(GOOG, [fast, functools.partial(every_nth_bar, n=2)]),
+                            make_key(GOOG, [fast, functools.partial(every_nth_bar, n=3)]))
+        self.assertNotEqual(make_key(GOOG, [make_every_nth_bar(1), make_every_nth_bar(2)]),
+                            make_key(GOOG, [make_every_nth_bar(1), make_every_nth_bar(3)]))
+
+    def test_key_captures_c_state(self):
+        self.assertNotEqual(make_key(GOOG, every_tenth_bar, rng=random.Random(1)),
+                            make_key(GOOG, every_tenth_bar, rng=random.Random(2)))
+        self.assertEqual(make_key(GOOG, every_tenth_bar, rng=random.Random(1)),
+                         make_key(GOOG, every_tenth_bar, rng=random.Random(1)))
+
+    def test_closure_hit_is_not_shared(self):
+        stats_10, _ = run_backtest(GOOG, make_every_nth_bar(10), cache=self.cache)
+        stats_7, _ = run_backtest(GOOG, make_every_nth_bar(7), cache=self.cache)
+        self.assertEqual(self.cache.hits, 0)
+        self.assertNotEqual(stats_10['# Trades'], stats_7['# Trades'])
+
+    def test_unstable_identity_bypasses_cache(self):
+        state = threading.Lock()
+        def signal(df, position, custom_data):
+            return every_nth_bar(df, position, custom_data, n=10 if state else 7)
+
+        with self.assertRaises(UncacheableError):
+            make_key(GOOG, every_tenth_bar, commission=threading.Lock())
+        with self.assertWarns(UserWarning):
+            run_backtest(GOOG, signal, cache=self.cache)
+        self.assertEqual(self.cache.info()['entries'], 0)
+
+    def test_concurrent_put(self):
+        stats, _ = run_backtest(GOOG, every_tenth_bar, cache=self.cache)
+        key = make_key(GOOG, every_tenth_bar)
+        with mock.patch.object(self.cache, 'invalidate', return_value=False):
+            self.cache.put(key, stats)
+        self.assertEqual(self.cache.info()['entries'], 1)
+        self.assertEqual(os.listdir(self.cache.path), [key])
+
+    def test_write_error_keeps_result(self):
+        with mock.patch.object(self.cache, 'put', side_effect=OSError("disk full")):
+            with self.assertWarns(UserWarning):
+                stats, _ = run_backtest(GOOG, every_tenth_bar, cache=self.cache)
+        self.assertGreater(stats['# Trades'], 0)
+
+    def test_concurrent_eviction(self):
+        run_backtest(GOOG, every_tenth_bar, cache=self.cache)
+        key = make_key(GOOG, every_tenth_bar)
+        self.cache.invalidate(key)
+        self.assertFalse(self.cache.invalidate(key))
+        self.assertEqual(self.cache._entry_size(key), 0)
+        with mock.patch('os.utime', side_effect=FileNotFoundError):
+            run_backtest(GOOG, every_tenth_bar, cache=self.cache)
+            self.assertIsNone(self.cache.get(key))
+
+    def test_path_like_cache(self):
+        path = pathlib.Path(self.tmp.name) / 'path_cache'
+        run_backtest(GOOG, every_tenth_bar, cache=path)
+        self.assertEqual(len(os.listdir(path)), 1)
+
+    def test_invalidate(self):
+        run_backtest(GOOG, every_tenth_bar, cache=self.cache)
+        self.assertTrue(self.cache.invalidate(make_key(GOOG, every_tenth_bar)))
+        run_backtest(GOOG, every_tenth_bar, cache=self.cache)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+    def test_eviction(self):
+        self.cache.max_size = 1
+        run_backtest(GOOG, every_tenth_bar, cache=self.cache)
+        self.assertEqual(self.cache.info()['entries'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
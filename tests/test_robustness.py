@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from algotrader.trade.robustness import (
+    resample_trades, delayed_entry_returns, equity_paths, max_drawdowns, run_monte_carlo
+)
+
+def make_stats(n_trades=200, seed=0):
+    rng = np.random.default_rng(seed)
+    trades = pd.DataFrame({
+        'Size': np.where(rng.random(n_trades) > 0.5, 1, -1),
+        'EntryBar': np.arange(n_trades) * 5,
+        'ExitBar': np.arange(n_trades) * 5 + 3,
+        'EntryPrice': 100.0,
+        'ExitPrice': 100.0 + rng.normal(0, 1, n_trades),
+        'PnL': rng.normal(5, 50, n_trades),
+        'ReturnPct': rng.normal(0.001, 0.01, n_trades),
+    })
+    equity_curve = pd.DataFrame({'Equity': [10000.0]})
+    return pd.Series({'_trades': trades, '_equity_curve': equity_curve})
+
+class TestRobustness(unittest.TestCase):
+
+    def test_permutation_keeps_trades(self):
+        values = np.arange(10.0)
+        paths = resample_trades(values, 50, method='permutation', rng=1)
+        self.assertEqual(paths.shape, (50, 10))
+        np.testing.assert_array_equal(np.sort(paths, axis=1), np.broadcast_to(values, (50, 10)))
+
+    def test_max_drawdown(self):
+        equity = equity_paths(np.array([[0.1, -0.5, 0.2]]))
+        np.testing.assert_allclose(max_drawdowns(equity), [0.5])
+
+    def test_delayed_entry_without_delay(self):
+        stats = make_stats()
+        trades = stats['_trades']
+        returns = delayed_entry_returns(trades, np.full(1000, 50.0), 5, max_delay=0, rng=1)
+        expected = np.sign(trades['Size']) * (trades['ExitPrice'] / trades['EntryPrice'] - 1)
+        np.testing.assert_allclose(returns, np.broadcast_to(expected, (5, len(trades))))
+
+    def test_seed_reproducible(self):
+        stats = make_stats()
+        summary_a, paths_a = run_monte_carlo(stats, n_paths=500, seed=42, chunk_size=100)
+        summary_b, paths_b = run_monte_carlo(stats, n_paths=500, seed=42, chunk_size=100, n_jobs=2)
+        pd.testing.assert_frame_equal(paths_a, paths_b)
+        pd.testing.assert_series_equal(summary_a, summary_b)
+
+    def test_risk_of_ruin(self):
+        stats = make_stats()
+        stats['_trades']['PnL'] = -100.0
+        summary, _ = run_monte_carlo(stats, n_paths=100, seed=0)
+        self.assertEqual(summary['Risk of Ruin [%]'], 100.0)
+
+    def test_permutation_matches_pnl_return(self):
+        stats = make_stats()
+        summary, _ = run_monte_carlo(stats, n_paths=100, method='permutation', seed=0)
+        expected = stats['_trades']['PnL'].sum() / 10000 * 100
+        self.assertAlmostEqual(summary['Return [%] Mean'], expected)
+
+    def test_entry_delay_pnl(self):
+        stats = make_stats()
+        trades = stats['_trades']
+        summary, _ = run_monte_carlo(stats, n_paths=10, method='entry_delay', prices=np.full(1000, 50.0), max_delay=0)
+        expected = (np.sign(trades['Size']) * (trades['ExitPrice'] - trades['EntryPrice']) * trades['Size'].abs()).sum()
+        self.assertAlmostEqual(summary['Return [%] Mean'], expected / 10000 * 100)
+
+    def test_entry_delay_requires_prices(self):
+        with self.assertRaises(ValueError):
+            run_monte_carlo(make_stats(), method='entry_delay')
+
+    def test_invalid_arguments(self):
+        stats = make_stats()
+        for kwargs in [{'n_paths': 0}, {'chunk_size': 0}, {'n_trades': 1},
+                       {'n_trades': 50, 'method': 'permutation'}]:
+            with self.assertRaises(ValueError):
+                run_monte_carlo(stats, **kwargs)
+
+if __name__ == '__main__':
+    unittest.main()